@@ -0,0 +1,54 @@
+import os
+import time
+import random
+import logging
+import argparse
+from collections import Counter
+from spiritual_core.metrics import percentile
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise completion routing against the stub backend")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--budget", type=float, default=6.0, help="per-request latency budget in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.2, help="share of completions that are degraded")
+    parser.add_argument("--slow-factor", type=float, default=10.0)
+    parser.add_argument("--completion-latency", type=float, default=1.0, help="stub gpt-4 latency in seconds")
+    parser.add_argument("--verbose", action="store_true", help="print every routing decision")
+    args = parser.parse_args()
+
+    # The stub reads its settings at import time, so configure it before importing the core
+    os.environ["SPIRITUAL_BACKEND"] = "stub"
+    os.environ["STUB_SLOW_RATE"] = str(args.slow_rate)
+    os.environ["STUB_SLOW_FACTOR"] = str(args.slow_factor)
+    os.environ["STUB_COMPLETION_LATENCY"] = str(args.completion_latency)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    from spiritual_core.retrieval import ask, get_prompt_templates
+
+    questions = [
+        "What does the Law of Choice teach?",
+        "How does the soul ascend across dimensions?",
+        "What is the reward of refinement?",
+        "Where does truth come from?",
+    ]
+    tones = list(get_prompt_templates().keys())
+    rng = random.Random(0)
+
+    latencies, sources = [], Counter()
+    for _ in range(args.requests):
+        question, tone = rng.choice(questions), rng.choice(tones)
+        trace = {}
+        start = time.monotonic()
+        ask(question, tone, latency_budget=args.budget, trace=trace)
+        latencies.append(time.monotonic() - start)
+        result = trace["completion"]
+        sources[result.model if result.source == "model" else result.source] += 1
+
+    print(f"requests: {args.requests}  budget: {args.budget:.1f}s  slow rate: {args.slow_rate:.0%}")
+    for pct in (50, 95, 99):
+        print(f"  p{pct:<3} {percentile(latencies, pct):6.2f}s")
+    print(f"  max  {max(latencies):6.2f}s")
+    print("answered by: " + ", ".join(f"{k}={v}" for k, v in sources.most_common()))
+
+if __name__ == "__main__":
+    main()
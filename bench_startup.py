@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Each probe runs in a fresh interpreter so nothing is already in sys.modules
+IMPORT_PROBE = """
+import time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+FIRST_REQUEST_PROBE = """
+import time, json
+start = time.perf_counter()
+from spiritual_core.retrieval import ask
+imported = time.perf_counter()
+ask({question!r}, {tone!r})
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_request": done - imported, "total": done - start}}))
+"""
+
+DEFAULT_MODULES = ["spiritual_core", "spiritual_core.retrieval", "embed_pdfs", "openai", "pinecone", "streamlit"]
+
+def run_probe(code, env):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first request")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--backend", default=os.getenv("SPIRITUAL_BACKEND", "stub"), choices=["stub", "live"])
+    parser.add_argument("--question", default="What does the Law of Choice teach about refinement?")
+    parser.add_argument("--tone", default="scriptural")
+    args = parser.parse_args()
+
+    env = dict(os.environ, SPIRITUAL_BACKEND=args.backend)
+
+    print("Import time (best of %d runs)" % args.runs)
+    for module in args.modules:
+        timings, error = [], None
+        for _ in range(args.runs):
+            result, error = run_probe(IMPORT_PROBE.format(module=module), env)
+            if result is None:
+                break
+            timings.append(result["seconds"])
+        if timings:
+            print(f"  {module:<28} {min(timings) * 1000:8.1f} ms")
+        else:
+            print(f"  {module:<28} {'n/a':>8}    ({error})")
+
+    print(f"Time to first request ({args.backend} backend, best of {args.runs} runs)")
+    runs = []
+    for _ in range(args.runs):
+        result, error = run_probe(FIRST_REQUEST_PROBE.format(question=args.question, tone=args.tone), env)
+        if result is None:
+            print(f"  failed: {error}")
+            return
+        runs.append(result)
+    best = min(runs, key=lambda r: r["total"])
+    print(f"  {'import':<28} {best['import'] * 1000:8.1f} ms")
+    print(f"  {'first request':<28} {best['first_request'] * 1000:8.1f} ms")
+    print(f"  {'total':<28} {best['total'] * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import re
+import random
+import string
+import timeit
+import argparse
+from spiritual_core.validation import SacredValidator, load_sacred_rules
+
+SAMPLE_QUESTIONS = [
+    "What does the Law of Choice teach about refinement of truth?",
+    "How do I understand the celestial dimension of the soul's ascension?",
+    "Explain the second point of resonant collapse in more depth please.",
+    "yeah right, like that ever happens",
+    "Why is this so hard??",
+]
+
+def legacy_validate(text, patterns, min_chars):
+    # The previous implementation: one re.search per pattern, lowering each time
+    for pattern in patterns:
+        if re.search(pattern, text.lower()):
+            return False
+    return len(text.strip()) >= min_chars
+
+def legacy_patterns(rules):
+    # One word-list pattern plus the raw patterns per rule, in rule order
+    patterns = []
+    for rule in rules["rules"].values():
+        words = rule.get("words", [])
+        if words:
+            patterns.append(r"\b(" + "|".join(re.escape(w) for w in words) + r")\b")
+        patterns.extend(rule.get("patterns", []))
+    return patterns
+
+def random_word(rng, length=8):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+def with_extra_words(rules, count, seed=0):
+    # The synthetic blocklist goes in its own rule so any rule file can be benchmarked
+    rng = random.Random(seed)
+    extended = dict(rules, rules=dict(rules["rules"]))
+    if count:
+        extended["rules"]["benchmark_blocklist"] = {
+            "words": [random_word(rng) for _ in range(count)],
+            "message": "benchmark",
+        }
+    return extended
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark for sacred input validation")
+    parser.add_argument("--blocklist-sizes", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    base_rules = load_sacred_rules()
+    print(f"{'blocklist':>10} {'legacy us/call':>16} {'compiled us/call':>18}")
+    for size in args.blocklist_sizes:
+        rules = with_extra_words(base_rules, size)
+        validator = SacredValidator(rules)
+        patterns = legacy_patterns(rules)
+        min_chars = rules.get("min_length", {}).get("chars", 0)
+
+        def run_compiled():
+            for q in SAMPLE_QUESTIONS:
+                validator.validate(q)
+
+        def run_legacy():
+            for q in SAMPLE_QUESTIONS:
+                legacy_validate(q, patterns, min_chars)
+
+        calls = len(SAMPLE_QUESTIONS)
+        compiled_us = timeit.timeit(run_compiled, number=args.number) / (args.number * calls) * 1e6
+        legacy_us = timeit.timeit(run_legacy, number=args.number) / (args.number * calls) * 1e6
+        print(f"{size:>10} {legacy_us:>16.2f} {compiled_us:>18.2f}")
+
+if __name__ == "__main__":
+    main()
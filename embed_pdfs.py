@@ -1,80 +1,14 @@
 import os
 import re
-import tiktoken
-from PyPDF2 import PdfReader
-from dotenv import load_dotenv
-from pinecone import Pinecone
-from openai import OpenAI
 import unicodedata
 import string
+from spiritual_core.clients import get_openai_client, get_index, load_env, EMBED_MODEL
+from spiritual_core.compression import embed_sentences
+from spiritual_core.tokens import get_encoding
+from spiritual_core.tags import get_tag_from_filename
 
-# Load environment variables
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-index = pc.Index(os.getenv("PINECONE_INDEX"))
-pdf_folder = os.getenv("PDF_FOLDER", "./pdfs")
-
-EMBED_MODEL = "text-embedding-ada-002"
 CHUNK_SIZE = 300
 
-PDF_TAGS = {
-    "Aetheral Expansion Thoughts and Discovery collection 1": {
-        "type": "exploration",
-        "theme": "aetheral",
-        "dimension": "celestial",
-        "tone": "philosophical"
-    },
-    "Ascension Theory": {
-        "type": "doctrine",
-        "topic": "ascension",
-        "tone": "teaching",
-        "dimension": "soul"
-    },
-    "In the vast tapestry of existence, the journey of creation and refinement is a process that began long before we were aware of our place in the universe": {
-        "type": "reflection",
-        "theme": "creation",
-        "tone": "contemplative",
-        "dimension": "origin"
-    },
-    "Laws of Creation Framework - thoughts": {
-        "type": "law_matrix",
-        "law": "multiple",
-        "tone": "scriptural",
-        "secondary_tone": "teaching"
-    },
-    "Master Compilation Bring the World His Truth": {
-        "type": "doctrine",
-        "theme": "truth",
-        "dimension": "mortal",
-        "tone": "prophetic"
-    },
-    "Matt the Trauma baby": {
-        "type": "testimony",
-        "theme": "trauma",
-        "tone": "personal",
-        "dimension": "mortal"
-    },
-    "Our freedom to Choose, the law of Choice and the refinement of Truths": {
-        "type": "law",
-        "law": "Law of Choice",
-        "tone": "explanatory",
-        "dimension": "moral"
-    },
-    "received my reward,": {
-        "type": "reflection",
-        "theme": "reward",
-        "tone": "personal",
-        "dimension": "celestial"
-    },
-    "Wow girl I really don’t know where to start -": {
-        "type": "dialogue",
-        "tone": "conversational",
-        "dimension": "emotional"
-    }
-}
-
 def to_ascii_id(text):
     # Normalize to NFKD and encode to ASCII, ignore errors (removes accents, smart quotes, etc.)
     ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
@@ -110,19 +44,14 @@ def clean_text(raw_text):
     return cleaned
 
 def chunk_text(text, chunk_size=CHUNK_SIZE):
-    enc = tiktoken.get_encoding("cl100k_base")
+    enc = get_encoding()
     tokens = enc.encode(text)
     chunks = [tokens[i:i+chunk_size] for i in range(0, len(tokens), chunk_size)]
     decoded_chunks = [enc.decode(chunk) for chunk in chunks]
     return decoded_chunks
 
-def get_tag_from_filename(filename):
-    for base_name, tags in PDF_TAGS.items():
-        if filename.lower().startswith(base_name.lower()):
-            return tags
-    return {"source": filename}
-
 def process_pdf(pdf_path, filename):
+    from PyPDF2 import PdfReader
     try:
         reader = PdfReader(pdf_path)
         full_text = ""
@@ -136,6 +65,8 @@ def process_pdf(pdf_path, filename):
         return ""
 
 def embed_and_upsert(filename, text):
+    client = get_openai_client()
+    index = get_index()
     tags = get_tag_from_filename(filename)
     chunks = chunk_text(text)
     for i, chunk in enumerate(chunks):
@@ -157,8 +88,16 @@ def embed_and_upsert(filename, text):
             print(f"Uploaded: {vector_id}")
         except Exception as e:
             print(f"Error embedding/uploading chunk {i} of {filename}: {e}")
+            continue
+        try:
+            # Sentence embeddings are cached now so queries can compress this chunk for free
+            embed_sentences([(vector_id, chunk)])
+        except Exception as e:
+            print(f"Error caching sentence embeddings for chunk {i} of {filename}: {e}")
 
 def main():
+    load_env()
+    pdf_folder = os.getenv("PDF_FOLDER", "./pdfs")
     for filename in os.listdir(pdf_folder):
         if filename.endswith(".pdf"):
             pdf_path = os.path.join(pdf_folder, filename)
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from spiritual_core.metrics import percentile
+from spiritual_core.conversation import ConversationMemory
+from spiritual_core.response_format import RESPONSE_FORMAT
+
+STAGES = ["queue", "embed", "query", "compress", "prompt", "completion", "total"]
+
+SAMPLE_QUESTIONS = [
+    "What does the Law of Choice teach about refinement of truth?",
+    "How does the soul ascend across dimensions?",
+    "Explain the second point more.",
+    "What is the reward of enduring refinement?",
+    "How do I recognise resonance in my daily choices?",
+    "Where does truth come from before mortality?",
+]
+
+def load_questions(path):
+    """Read questions from a .jsonl file ("question", or "title" + "body") or plain text lines."""
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                entry = json.loads(line)
+                question = entry.get("question") or " ".join(
+                    part for part in (entry.get("title"), entry.get("body")) if part
+                )
+            else:
+                question = line
+            if question:
+                questions.append(question)
+    return questions
+
+class Session:
+    """One simulated chat user, called the way spiritual_assistant_app.py calls ask()."""
+
+    def __init__(self):
+        self.memory = ConversationMemory()
+        # A Streamlit session answers one question at a time
+        self.lock = threading.Lock()
+
+def run_rate(ask, questions, tones, rate, requests, workers, budget, rng, sessions=None):
+    """Replay requests with Poisson arrivals at rate/s against a pool of workers.
+
+    With sessions, each request goes to a random session and is asked with its
+    conversation memory and the chat app's response format.
+    """
+    records = []
+    errors = 0
+    lock = threading.Lock()
+
+    def handle(question, tone, arrival, session):
+        nonlocal errors
+        trace = {}
+        try:
+            if session is None:
+                started = time.monotonic()
+                ask(question, tone, latency_budget=budget, trace=trace)
+            else:
+                with session.lock:
+                    started = time.monotonic()
+                    ask(question, tone, memory=session.memory, response_format=RESPONSE_FORMAT,
+                        latency_budget=budget, trace=trace)
+        except Exception as e:
+            with lock:
+                errors += 1
+            print(f"request failed: {e}", file=sys.stderr)
+            return
+        finished = time.monotonic()
+        record = dict(trace.get("timings", {}))
+        record["queue"] = started - arrival
+        record["total"] = finished - arrival
+        record["finished"] = finished
+        if trace.get("compression"):
+            record["compression_ratio"] = trace["compression"]["ratio"]
+        with lock:
+            records.append(record)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.monotonic()
+        next_arrival = start
+        for _ in range(requests):
+            next_arrival += rng.expovariate(rate)
+            delay = next_arrival - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            session = rng.choice(sessions) if sessions else None
+            pool.submit(handle, rng.choice(questions), rng.choice(tones), time.monotonic(), session)
+    elapsed = max((r["finished"] for r in records), default=time.monotonic()) - start
+    return records, errors, elapsed
+
+def report(rate, records, errors, elapsed):
+    throughput = len(records) / elapsed if elapsed > 0 else 0.0
+    print(f"\narrival rate {rate:g}/s: {len(records)} ok, {errors} failed, "
+          f"throughput {throughput:.2f}/s over {elapsed:.1f}s")
+    print(f"  {'stage':<12} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for stage in STAGES:
+        values = [r[stage] for r in records if stage in r]
+        if values:
+            print(f"  {stage:<12} {percentile(values, 50):8.3f} {percentile(values, 95):8.3f} "
+                  f"{percentile(values, 99):8.3f} {max(values):8.3f}")
+    ratios = [r["compression_ratio"] for r in records if "compression_ratio" in r]
+    if ratios:
+        print(f"  context kept after compression: {sum(ratios) / len(ratios):.0%} on average")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the answer pipeline with concurrent simulated users")
+    parser.add_argument("--questions", help="question mix (.jsonl or one question per line)")
+    parser.add_argument("--rates", type=float, nargs="+", default=[0.5, 1, 2, 4], help="arrival rates in requests/s")
+    parser.add_argument("--requests", type=int, default=50, help="requests replayed per rate")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests one worker process serves")
+    parser.add_argument("--budget", type=float, default=None, help="per-request latency budget in seconds")
+    parser.add_argument("--app-shape", action="store_true",
+                        help="replay spiritual_assistant_app.py calls: per-session memory and its response format")
+    parser.add_argument("--sessions", type=int, default=20, help="simulated chat sessions with --app-shape")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="hit OpenAI and Pinecone instead of the stub backend")
+    args = parser.parse_args()
+
+    if not args.live:
+        os.environ["SPIRITUAL_BACKEND"] = "stub"
+    from spiritual_core.retrieval import ask, get_prompt_templates
+
+    questions = load_questions(args.questions) if args.questions else SAMPLE_QUESTIONS
+    tones = list(get_prompt_templates().keys())
+    rng = random.Random(args.seed)
+    shape = f"app shape, {args.sessions} sessions" if args.app_shape else "single-shot"
+    print(f"{len(questions)} questions, {len(tones)} tones, {args.workers} workers, "
+          f"{'live' if args.live else 'stub'} backend, {shape}")
+    for rate in args.rates:
+        # Fresh sessions per rate so conversation memory does not carry over between runs
+        sessions = [Session() for _ in range(args.sessions)] if args.app_shape else None
+        records, errors, elapsed = run_rate(
+            ask, questions, tones, rate, args.requests, args.workers, args.budget, rng, sessions
+        )
+        report(rate, records, errors, elapsed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from spiritual_core.clients import get_index, load_env
+from spiritual_core.tags import get_tag_from_filename
+from embed_pdfs import to_ascii_id
+
+UPDATE_WORKERS = 16
+FETCH_BATCH = 100
+CHUNK_KEYS = {"source_file", "chunk_index", "text"}  # written by embed_pdfs.py, never tags
+
+def chunk_ids(index, filename):
+    # Chunk vectors are stored as "<ascii id>_<chunk index>"; the digit check keeps
+    # "Foo" from also picking up the chunks of "Foo_Bar"
+    prefix = f"{to_ascii_id(filename)}_"
+    pattern = re.compile(re.escape(prefix) + r"\d+$")
+    ids = []
+    for page in index.list(prefix=prefix):
+        ids.extend(vid for vid in page if pattern.match(vid))
+    return ids
+
+def retag_metadata(tags, existing):
+    metadata = dict(tags)
+    # Pinecone merges metadata on update, so blank out tags this vector still carries
+    # but the registry no longer gives it; the previous registry may have listed keys
+    # that no current entry has, so look at the vector itself
+    for key, value in existing.items():
+        if key not in metadata and key not in CHUNK_KEYS and value != "":
+            metadata[key] = ""
+    return metadata
+
+def retag_file(index, filename):
+    ids = chunk_ids(index, filename)
+    tags = get_tag_from_filename(filename)
+    updates = []
+    for start in range(0, len(ids), FETCH_BATCH):
+        fetched = index.fetch(ids=ids[start:start + FETCH_BATCH]).vectors
+        for vid, vector in fetched.items():
+            updates.append((vid, retag_metadata(tags, vector.metadata or {})))
+    with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as pool:
+        list(pool.map(lambda u: index.update(id=u[0], set_metadata=u[1]), updates))
+    return len(updates)
+
+def main():
+    load_env()
+    pdf_folder = os.getenv("PDF_FOLDER", "./pdfs")
+    index = get_index()
+    for filename in os.listdir(pdf_folder):
+        if filename.endswith(".pdf"):
+            name = filename.replace(".pdf", "")
+            try:
+                count = retag_file(index, name)
+                print(f"Retagged {count} chunks of {name}")
+            except Exception as e:
+                print(f"Error retagging {name}: {e}")
+
+if __name__ == "__main__":
+    main()
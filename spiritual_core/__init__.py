@@ -0,0 +1,5 @@
+"""Shared core for the Spiritual Assistant entry points.
+
+Importing this package is cheap: the OpenAI and Pinecone SDKs, tiktoken and
+the network clients are only loaded on first use.
+"""
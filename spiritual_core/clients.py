@@ -0,0 +1,59 @@
+import os
+import threading
+
+EMBED_MODEL = "text-embedding-ada-002"
+
+_lock = threading.Lock()
+_openai_client = None
+_index = None
+_env_loaded = False
+
+def load_env():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def get_backend():
+    # Set SPIRITUAL_BACKEND=stub to run against the in-process stand-in backend
+    # (see spiritual_core/stub.py) instead of OpenAI and Pinecone.
+    load_env()
+    return os.getenv("SPIRITUAL_BACKEND", "live")
+
+def get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                if get_backend() == "stub":
+                    from .stub import StubOpenAI
+                    _openai_client = StubOpenAI()
+                else:
+                    from openai import OpenAI
+                    _openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
+
+def get_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                if get_backend() == "stub":
+                    from .stub import StubIndex
+                    _index = StubIndex()
+                else:
+                    from pinecone import Pinecone
+                    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+                    _index = pc.Index(os.getenv("PINECONE_INDEX"))
+    return _index
+
+def create_embeddings(texts, timeout=None):
+    """Embed texts in one call. With a timeout, SDK retries are disabled so the call stays within it."""
+    client = get_openai_client()
+    options = {}
+    if timeout is not None:
+        client = client.with_options(max_retries=0)
+        options["timeout"] = timeout
+    resp = client.embeddings.create(model=EMBED_MODEL, input=texts, **options)
+    return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
@@ -0,0 +1,247 @@
+import os
+import re
+import json
+import time
+import logging
+import math
+import hashlib
+import operator
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from .clients import create_embeddings, load_env
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Written at ingest time; override with SENTENCE_CACHE_DIR. Autoscaled workers only
+# benefit if this points at storage they share with the ingest host; otherwise each
+# worker embeds a chunk's sentences the first time it retrieves that chunk, and
+# keeps them from then on.
+DEFAULT_SENTENCE_CACHE_DIR = ".sentence_cache"
+DEFAULT_SENTENCE_CACHE_SIZE = 1024  # chunks held in memory, ~90 KB each; override with SENTENCE_CACHE_SIZE
+EMBED_WAIT_SECONDS = 2.0  # longest a request waits for uncached chunks before sending them whole
+EMBED_WORKERS = 2
+MAX_SENTENCES = 12       # sentences kept across all retrieved chunks
+MIN_SENTENCE_CHARS = 20  # shorter fragments are merged into the next sentence
+
+# USD per 1k input tokens, used to report the saving of each compressed prompt
+INPUT_PRICE_PER_1K = {
+    "gpt-4": 0.03,
+    "gpt-4o": 0.0025,
+    "gpt-3.5-turbo": 0.0005,
+}
+PREFILL_SECONDS_PER_1K = 0.15  # rough prefill time per 1k input tokens, for the latency estimate
+
+def split_sentences(text):
+    parts = re.split(r"(?<=[.!?])\s+|\n+", text)
+    sentences, pending = [], ""
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        sentences.append(pending)
+    return sentences
+
+def normalize(vector):
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+def dot(a, b):
+    return sum(map(operator.mul, a, b))
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class SentenceCache:
+    """Sentence splits and embeddings per chunk vector, kept in memory and on disk.
+
+    Entries record a hash of the chunk text they were built from, so a chunk that
+    was re-ingested with new text under the same vector ID is treated as a miss.
+    """
+
+    def __init__(self, directory=DEFAULT_SENTENCE_CACHE_DIR, max_entries=DEFAULT_SENTENCE_CACHE_SIZE):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, vector_id):
+        return os.path.join(self.directory, f"{vector_id}.json")
+
+    def _remember(self, vector_id, entry):
+        # Embeddings are held unit-length so scoring is a plain dot product, and as
+        # float32 arrays, ~6x smaller than lists of Python floats
+        entry = dict(entry, embeddings=[array("f", normalize(e)) for e in entry["embeddings"]])
+        with self._lock:
+            self.entries[vector_id] = entry
+            self.entries.move_to_end(vector_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def get(self, vector_id, text):
+        digest = text_hash(text)
+        with self._lock:
+            entry = self.entries.get(vector_id)
+            if entry is not None and entry.get("text_hash") == digest:
+                self.entries.move_to_end(vector_id)
+                return entry
+        try:
+            with open(self._path(vector_id), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("text_hash") != digest:
+            return None
+        return self._remember(vector_id, entry)
+
+    def put(self, vector_id, text, sentences, embeddings):
+        entry = {"text_hash": text_hash(text), "sentences": sentences, "embeddings": embeddings}
+        os.makedirs(self.directory, exist_ok=True)
+        # A temp file per write, so concurrent writers of one chunk cannot tear each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(vector_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self._remember(vector_id, entry)
+
+_sentence_cache = None
+
+def get_sentence_cache():
+    global _sentence_cache
+    if _sentence_cache is None:
+        load_env()
+        _sentence_cache = SentenceCache(
+            os.getenv("SENTENCE_CACHE_DIR", DEFAULT_SENTENCE_CACHE_DIR),
+            int(os.getenv("SENTENCE_CACHE_SIZE", DEFAULT_SENTENCE_CACHE_SIZE)),
+        )
+    return _sentence_cache
+
+_embed_pool = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="sentence-embed")
+_pending = {}  # vector_id -> Future embedding it
+_pending_lock = threading.RLock()
+
+def _forget_pending(vector_ids, future):
+    with _pending_lock:
+        for vector_id in vector_ids:
+            if _pending.get(vector_id) is future:
+                del _pending[vector_id]
+
+def embed_sentences(chunks, timeout=None):
+    """Split and embed several (vector_id, text) chunks with a single embeddings call."""
+    cache = get_sentence_cache()
+    split = [(vector_id, text, split_sentences(text)) for vector_id, text in chunks]
+    flat = [s for _, _, sentences in split for s in sentences]
+    vectors = create_embeddings(flat, timeout) if flat else []
+    entries, offset = {}, 0
+    for vector_id, text, sentences in split:
+        entries[vector_id] = cache.put(vector_id, text, sentences, vectors[offset:offset + len(sentences)])
+        offset += len(sentences)
+    return entries
+
+def schedule_embedding(chunks):
+    """Embed (vector_id, text) chunks in the background, at most once at a time per chunk.
+
+    Returns the futures covering the chunks; each resolves to an embed_sentences result.
+    """
+    with _pending_lock:
+        futures = {_pending[vector_id] for vector_id, _ in chunks if vector_id in _pending}
+        new = [(vector_id, text) for vector_id, text in chunks if vector_id not in _pending]
+        if new:
+            future = _embed_pool.submit(embed_sentences, new)
+            ids = [vector_id for vector_id, _ in new]
+            for vector_id in ids:
+                _pending[vector_id] = future
+            future.add_done_callback(lambda f: _forget_pending(ids, f))
+            futures.add(future)
+    return futures
+
+def compress_matches(question_vector, matches, max_sentences=MAX_SENTENCES, timeout=EMBED_WAIT_SECONDS):
+    """Keep only the sentences closest to the question, with their source.
+
+    Chunks without cached sentence embeddings (e.g. ingested before compression
+    existed) are embedded in the background. The request waits for them at most
+    timeout seconds and otherwise sends them whole; later requests find them cached.
+
+    Returns the compressed matches, in the shape build_prompt expects, and a
+    stats dict describing the compression.
+    """
+    start = time.monotonic()
+    cache = get_sentence_cache()
+    entries = {m['id']: cache.get(m['id'], m['metadata']['text']) for m in matches}
+    missing = [(m['id'], m['metadata']['text']) for m in matches if entries[m['id']] is None]
+    if missing:
+        done, _ = wait(schedule_embedding(missing), timeout=timeout)
+        for future in done:
+            if future.exception() is not None:
+                logger.warning("sentence embedding failed: %s", future.exception())
+                continue
+            entries.update((vid, entry) for vid, entry in future.result().items() if vid in entries)
+
+    question_vector = normalize(question_vector)
+    scored = []
+    for position, m in enumerate(matches):
+        entry = entries[m['id']]
+        if entry is None:
+            continue
+        for i, (sentence, vector) in enumerate(zip(entry["sentences"], entry["embeddings"])):
+            scored.append((dot(question_vector, vector), position, i, sentence))
+    # Keep the best sentences, then restore document order within each chunk
+    kept = sorted(sorted(scored, key=lambda k: k[0], reverse=True)[:max_sentences], key=lambda k: (k[1], k[2]))
+
+    compressed = []
+    passed_through = 0
+    for position, m in enumerate(matches):
+        if entries[m['id']] is None:
+            compressed.append(m)
+            passed_through += 1
+            continue
+        sentences = [s for _, p, _, s in kept if p == position]
+        if not sentences:
+            continue
+        meta = m['metadata']
+        source = f"[{meta.get('source_file', m['id'])}, chunk {meta.get('chunk_index', 0)}]"
+        metadata = dict(meta)
+        metadata['text'] = f"{source} " + " ".join(sentences)
+        compressed.append({'id': m['id'], 'score': m['score'], 'metadata': metadata})
+
+    original_tokens = sum(estimate_tokens(m['metadata']['text']) for m in matches)
+    compressed_tokens = sum(estimate_tokens(m['metadata']['text']) for m in compressed)
+    if compressed_tokens >= original_tokens:
+        # Short contexts are kept whole; the source labels would only add tokens
+        compressed, compressed_tokens = list(matches), original_tokens
+    stats = {
+        "original_tokens": original_tokens,
+        "compressed_tokens": compressed_tokens,
+        "ratio": compressed_tokens / original_tokens if original_tokens else 1.0,
+        "seconds": time.monotonic() - start,
+        "uncached_chunks": len(missing),
+        "passed_through_chunks": passed_through,
+    }
+    return compressed, stats
+
+def report_savings(stats, model):
+    """Add the estimated cost and prefill savings for the model that answered."""
+    saved = stats["original_tokens"] - stats["compressed_tokens"]
+    stats["tokens_saved"] = saved
+    stats["cost_saved_usd"] = saved / 1000 * INPUT_PRICE_PER_1K.get(model, 0.0)
+    stats["prefill_seconds_saved"] = saved / 1000 * PREFILL_SECONDS_PER_1K
+    logger.info(
+        "context compression: %d -> %d tokens (%.0f%%) in %.3fs, saved ~$%.4f and ~%.2fs prefill on %s",
+        stats["original_tokens"], stats["compressed_tokens"], stats["ratio"] * 100,
+        stats["seconds"], stats["cost_saved_usd"], stats["prefill_seconds_saved"], model,
+    )
+    return stats
@@ -0,0 +1,52 @@
+import math
+from .tokens import count_tokens, truncate_tokens
+
+SUMMARY_TOKEN_BUDGET = 400   # upper bound on the rolling summary passed to retrieval and the prompt
+ANSWER_EXCERPT_TOKENS = 80   # how much of each answer is kept in the summary
+REUSE_SIMILARITY = 0.92      # cosine similarity above which the previous matches are reused
+
+def cosine_similarity(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+class ConversationMemory:
+    """Rolling, token-bounded memory of prior turns for one chat session."""
+
+    def __init__(self, token_budget=SUMMARY_TOKEN_BUDGET, reuse_similarity=REUSE_SIMILARITY):
+        self.token_budget = token_budget
+        self.reuse_similarity = reuse_similarity
+        self.turns = []  # (text, token_count) per turn, oldest first
+        self.last_embedding = None
+        self.last_matches = None
+
+    def summary(self):
+        return "\n".join(text for text, _ in self.turns)
+
+    def add_turn(self, question, answer):
+        question_text, _ = truncate_tokens(question, self.token_budget // 4)
+        answer_text, _ = truncate_tokens(" ".join(answer.split()), min(ANSWER_EXCERPT_TOKENS, self.token_budget // 2))
+        text = f"Q: {question_text}\nA: {answer_text}"
+        self.turns.append((text, count_tokens(text)))
+        # Drop the oldest turns until the summary fits the budget again
+        while len(self.turns) > 1 and sum(n for _, n in self.turns) > self.token_budget:
+            self.turns.pop(0)
+
+    def rewrite_query(self, question):
+        """Fold the rolling summary into the retrieval query so follow-ups keep their referent."""
+        if not self.turns:
+            return question
+        return f"{self.summary()}\nFollow-up question: {question}"
+
+    def reusable_matches(self, embedding):
+        """Return the last retrieved matches if this question's embedding stays close to
+        the question that retrieved them. Pass the bare question, not rewrite_query()."""
+        if self.last_embedding is None:
+            return None
+        if cosine_similarity(embedding, self.last_embedding) >= self.reuse_similarity:
+            return self.last_matches
+        return None
+
+    def remember_retrieval(self, embedding, matches):
+        self.last_embedding = embedding
+        self.last_matches = matches
@@ -0,0 +1,7 @@
+def percentile(values, pct):
+    """Nearest-rank percentile of values; 0.0 when there are none."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[rank]
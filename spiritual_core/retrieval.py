@@ -0,0 +1,157 @@
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .clients import get_index, create_embeddings
+from .routing import get_router, MIN_ATTEMPT_SECONDS
+from .compression import compress_matches, report_savings, EMBED_WAIT_SECONDS
+
+# --- Prompt Template Loader ---
+def load_prompt_templates(path="prompt_templates.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+_prompt_templates = None
+
+def get_prompt_templates():
+    global _prompt_templates
+    if _prompt_templates is None:
+        _prompt_templates = load_prompt_templates()
+    return _prompt_templates
+
+logger = logging.getLogger(__name__)
+
+QUERY_WORKERS = 8
+
+# Pinecone queries with a deadline run here so the caller can stop waiting
+_query_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="index-query")
+
+def get_embedding(text, timeout=None):
+    return create_embeddings([text], timeout)[0]
+
+def get_embeddings(texts, timeout=None):
+    return create_embeddings(texts, timeout)
+
+def query_index(vector, top_k=10, timeout=None):
+    if timeout is None:
+        results = get_index().query(vector=vector, top_k=top_k, include_metadata=True)
+    else:
+        future = _query_pool.submit(get_index().query, vector=vector, top_k=top_k, include_metadata=True)
+        try:
+            results = future.result(timeout=timeout)
+        except TimeoutError:
+            raise TimeoutError(f"index query timed out after {timeout:.2f}s") from None
+    return results['matches']
+
+def pinecone_query(question, top_k=10):
+    return query_index(get_embedding(question), top_k)
+
+def build_prompt(question, matches, tone="scriptural", conversation_summary="", response_format=""):
+    context = "\n\n".join([m['metadata']['text'] for m in matches])
+    law_names = [m['metadata'].get('law', '') for m in matches if m['metadata'].get('law')]
+    tone_instr = get_prompt_templates()[tone]
+    law_clause = f"\nIf possible, reference or cite the following laws: {', '.join(set(law_names))}." if law_names else ""
+    conversation_clause = f"\nConversation so far:\n{conversation_summary}\n" if conversation_summary else ""
+    format_clause = f"\n{response_format.strip()}\n\n" if response_format else ""
+    prompt = f"""
+You are a sacred spiritual assistant. Respond to the user's question referring to the content provided below, and always reflect the Laws of Creation framework.
+
+Context:
+{context}
+{conversation_clause}
+Question:
+{question}
+
+Instructions:
+{tone_instr}{law_clause}
+{format_clause}If you cannot find an answer, state that you do not have information grounded in the provided context.
+Do not invent information. Do not hallucinate beyond the source material.
+"""
+    return prompt.strip()
+
+def ask(question, tone="scriptural", top_k=10, memory=None, response_format="", latency_budget=None, trace=None,
+        compress=True):
+    router = get_router()
+    # The budget covers the whole request: every upstream call gets what is left of it
+    start = time.monotonic()
+    deadline = start + (latency_budget or router.latency_budget)
+    # The fallback cache is shared by every session in the worker, so the key covers
+    # everything that shapes the answer besides the question: a follow-up is only
+    # ever answered from the same conversation state
+    conversation_state = memory.summary() if memory is not None else ""
+    cache_key = (
+        question.strip().lower(),
+        tone,
+        hashlib.sha1(f"{conversation_state}\0{response_format}".encode("utf-8")).hexdigest(),
+    )
+    timings = {}
+    mark = start
+
+    def lap(stage):
+        nonlocal mark
+        now = time.monotonic()
+        timings[stage] = now - mark
+        mark = now
+
+    def remaining():
+        left = deadline - time.monotonic()
+        if left < MIN_ATTEMPT_SECONDS:
+            raise TimeoutError(f"only {max(left, 0):.2f}s of the latency budget left")
+        return left
+
+    try:
+        if memory is None:
+            query_vector = get_embedding(question, timeout=remaining())
+            lap("embed")
+            matches = query_index(query_vector, top_k, timeout=remaining())
+            lap("query")
+            conversation_summary = ""
+        else:
+            # Reuse is decided on the bare follow-up, since consecutive rewrites share
+            # most of their summary text; retrieval and compression use the rewritten
+            # query so a follow-up keeps its referent
+            rewritten = memory.rewrite_query(question)
+            if rewritten == question:
+                vector = query_vector = get_embedding(question, timeout=remaining())
+            else:
+                vector, query_vector = get_embeddings([question, rewritten], timeout=remaining())
+            lap("embed")
+            matches = memory.reusable_matches(vector)
+            if matches is None:
+                matches = query_index(query_vector, top_k, timeout=remaining())
+                memory.remember_retrieval(vector, matches)
+            lap("query")
+            conversation_summary = memory.summary()
+    except Exception as e:
+        # Without context there is nothing grounded to send to the model
+        logger.warning("retrieval failed after %.2fs: %s", time.monotonic() - start, e)
+        lap("retrieval_failed")
+        result = router.fallback(cache_key, start=start)
+        if trace is not None:
+            trace["completion"] = result
+            trace["timings"] = timings
+            trace["compression"] = None
+        return result.answer
+
+    compression = None
+    if compress:
+        try:
+            matches, compression = compress_matches(query_vector, matches, timeout=min(remaining(), EMBED_WAIT_SECONDS))
+        except Exception as e:
+            logger.warning("context compression skipped: %s", e)
+        lap("compress")
+    prompt = build_prompt(question, matches, tone, conversation_summary, response_format)
+    lap("prompt")
+    result = router.complete(prompt, tone, cache_key=cache_key, deadline=deadline)
+    lap("completion")
+    answer = result.answer
+    if compression is not None:
+        report_savings(compression, result.model)
+    if trace is not None:
+        trace["completion"] = result
+        trace["timings"] = timings
+        trace["compression"] = compression
+    if memory is not None:
+        memory.add_turn(question, answer)
+    return answer
@@ -0,0 +1,134 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from .clients import get_openai_client, load_env
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Seconds per request, overridable with COMPLETION_LATENCY_BUDGET. gpt-4 generates
+# roughly 20-40 tokens/s without streaming, so a full 600-token structured answer
+# plus prefill of a ~3k-token prompt takes 20-30s. With 45s and FALLBACK_RESERVE,
+# gpt-4 gets ~30s after retrieval and the fast model keeps ~13s, enough for its
+# own 600 tokens. Lower this only after measuring gpt-4 latency for your prompts.
+DEFAULT_LATENCY_BUDGET = 45.0
+PRIMARY_MODEL = "gpt-4"
+LONG_CONTEXT_MODEL = "gpt-4o"   # used when the prompt would not fit gpt-4's 8k window
+FAST_MODEL = "gpt-3.5-turbo"    # fallback when the deadline is near
+FAST_TONES = {"conversational"}  # tones that do not need the primary model
+PRIMARY_CONTEXT_TOKENS = 8192
+MAX_TOKENS = 600
+FALLBACK_RESERVE = 0.3          # share of the remaining budget held back for the fallback model
+MIN_ATTEMPT_SECONDS = 1.0       # do not start a model call with less time than this
+ANSWER_CACHE_SIZE = 256
+
+class CompletionResult:
+    def __init__(self, answer, model, source, elapsed, decisions):
+        self.answer = answer
+        self.model = model
+        self.source = source  # "model", "cache" or "unavailable"
+        self.elapsed = elapsed
+        self.decisions = decisions
+
+class CompletionRouter:
+    """Pick a chat model per request and fall back within a latency budget."""
+
+    def __init__(self, latency_budget=None, cache_size=ANSWER_CACHE_SIZE):
+        if latency_budget is None:
+            load_env()
+            latency_budget = float(os.getenv("COMPLETION_LATENCY_BUDGET", DEFAULT_LATENCY_BUDGET))
+        self.latency_budget = latency_budget
+        self.cache_size = cache_size
+        self.answer_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def choose_model(self, prompt, tone):
+        prompt_tokens = estimate_tokens(prompt)
+        if prompt_tokens + MAX_TOKENS > PRIMARY_CONTEXT_TOKENS:
+            return LONG_CONTEXT_MODEL, f"prompt ~{prompt_tokens} tokens exceeds {PRIMARY_MODEL} context"
+        if tone in FAST_TONES:
+            return FAST_MODEL, f"tone '{tone}' routed to fast model"
+        return PRIMARY_MODEL, "default model"
+
+    def _log(self, decisions, message, *args):
+        text = message % args
+        decisions.append(text)
+        logger.info("completion routing: %s", text)
+
+    def _call(self, model, prompt, timeout):
+        # Retries would overrun the deadline; falling back is the retry
+        client = get_openai_client().with_options(max_retries=0)
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=MAX_TOKENS,
+            temperature=0.1,
+            timeout=timeout,
+        )
+        return response.choices[0].message.content.strip()
+
+    def _cached(self, cache_key):
+        with self._cache_lock:
+            return self.answer_cache.get(cache_key)
+
+    def _remember(self, cache_key, answer):
+        with self._cache_lock:
+            self.answer_cache[cache_key] = answer
+            self.answer_cache.move_to_end(cache_key)
+            while len(self.answer_cache) > self.cache_size:
+                self.answer_cache.popitem(last=False)
+
+    def complete(self, prompt, tone="scriptural", cache_key=None, deadline=None):
+        start = time.monotonic()
+        if deadline is None:
+            deadline = start + self.latency_budget
+        decisions = []
+        model, reason = self.choose_model(prompt, tone)
+        self._log(decisions, "selected %s (%s)", model, reason)
+
+        attempts = [model] if model == FAST_MODEL else [model, FAST_MODEL]
+        for i, attempt in enumerate(attempts):
+            remaining = deadline - time.monotonic()
+            is_last = i == len(attempts) - 1
+            # Hold part of the budget back so a fallback still has time to answer
+            timeout = remaining if is_last else remaining * (1 - FALLBACK_RESERVE)
+            if timeout < MIN_ATTEMPT_SECONDS:
+                self._log(decisions, "skipped %s, only %.2fs left", attempt, remaining)
+                continue
+            try:
+                answer = self._call(attempt, prompt, timeout)
+            except Exception as e:
+                self._log(decisions, "%s failed after %.2fs: %s", attempt, time.monotonic() - start, e)
+                continue
+            if cache_key is not None:
+                self._remember(cache_key, answer)
+            elapsed = time.monotonic() - start
+            self._log(decisions, "answered by %s in %.2fs", attempt, elapsed)
+            return CompletionResult(answer, attempt, "model", elapsed, decisions)
+
+        return self.fallback(cache_key, decisions, start)
+
+    def fallback(self, cache_key=None, decisions=None, start=None):
+        """Answer without a model: the last good answer for cache_key, or an apology."""
+        decisions = [] if decisions is None else decisions
+        start = time.monotonic() if start is None else start
+        cached = self._cached(cache_key) if cache_key is not None else None
+        elapsed = time.monotonic() - start
+        if cached is not None:
+            self._log(decisions, "served cached answer after %.2fs", elapsed)
+            return CompletionResult(cached, None, "cache", elapsed, decisions)
+        self._log(decisions, "no answer within budget after %.2fs", elapsed)
+        return CompletionResult(
+            "The assistant could not reflect on this in time. Please ask again in a moment.",
+            None, "unavailable", elapsed, decisions,
+        )
+
+_router = None
+
+def get_router():
+    global _router
+    if _router is None:
+        _router = CompletionRouter()
+    return _router
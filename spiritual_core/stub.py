@@ -0,0 +1,148 @@
+"""In-process stand-ins for the OpenAI client and the Pinecone index.
+
+Used for benchmarks and load tests. Embeddings are hashed bags of words, so
+similar texts get similar vectors, and every call sleeps for a configurable,
+jittered latency to mimic the upstream services.
+"""
+import os
+import math
+import time
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+
+STUB_DIMENSION = 256
+STUB_EMBED_LATENCY = float(os.getenv("STUB_EMBED_LATENCY", "0.03"))
+STUB_QUERY_LATENCY = float(os.getenv("STUB_QUERY_LATENCY", "0.05"))
+STUB_COMPLETION_LATENCY = float(os.getenv("STUB_COMPLETION_LATENCY", "2.0"))
+STUB_JITTER = float(os.getenv("STUB_JITTER", "0.3"))  # sigma of the lognormal latency jitter
+STUB_SLOW_RATE = float(os.getenv("STUB_SLOW_RATE", "0"))  # share of completions hit by upstream degradation
+STUB_SLOW_FACTOR = float(os.getenv("STUB_SLOW_FACTOR", "10"))  # latency multiplier for degraded completions
+
+# Relative completion latency per model, compared to gpt-4
+MODEL_SPEED = {
+    "gpt-4": 1.0,
+    "gpt-4o": 0.45,
+    "gpt-4o-mini": 0.25,
+    "gpt-3.5-turbo": 0.25,
+}
+
+STUB_CORPUS = [
+    ("Laws of Creation Framework - thoughts", "Law of Choice",
+     "Every soul carries the freedom to choose. The Law of Choice refines truth through agency. "
+     "Choices made in resonance draw the soul toward light, while dissonance invites collapse."),
+    ("Ascension Theory", "",
+     "Ascension is the gradual refinement of the soul across dimensions. Each dimensional shift "
+     "follows harmonic alignment with the Christic pattern. The soul does not leap but is refined."),
+    ("Aetheral Expansion Thoughts and Discovery collection 1", "",
+     "The aetheral realm expands as awareness grows. Celestial resonance fields surround every "
+     "creation. Discovery is the echo of truths we knew before mortality."),
+    ("Master Compilation Bring the World His Truth", "",
+     "Truth is brought to the world through prophetic refinement. The mortal journey is a school "
+     "of resonance. Convergence happens when many hearts align with eternal law."),
+    ("Our freedom to Choose, the law of Choice and the refinement of Truths", "Law of Choice",
+     "Agency precedes refinement. Without the freedom to choose there is no growth. "
+     "Truths are refined as choices are tested against resonance."),
+    ("received my reward,", "",
+     "The reward is not a prize but a state of harmonic alignment. Celestial joy is the fruit of "
+     "endured refinement. Peace settles where resonance is restored."),
+]
+
+def _sleep(base, timeout=None):
+    if base <= 0:
+        return
+    latency = base * random.lognormvariate(0, STUB_JITTER)
+    if timeout is not None and latency > timeout:
+        # Behave like the SDK: give up at the timeout instead of waiting it out
+        time.sleep(max(timeout, 0))
+        raise TimeoutError(f"stub request timed out after {timeout:.2f}s")
+    time.sleep(latency)
+
+def embed_text(text):
+    vector = [0.0] * STUB_DIMENSION
+    for word in text.lower().split():
+        word = word.strip(".,;:!?\"'()")
+        if word:
+            bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % STUB_DIMENSION
+            vector[bucket] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+class _Embeddings:
+    def create(self, model, input, timeout=None, **kwargs):
+        _sleep(STUB_EMBED_LATENCY, timeout)
+        inputs = [input] if isinstance(input, str) else list(input)
+        data = [SimpleNamespace(embedding=embed_text(text), index=i) for i, text in enumerate(inputs)]
+        return SimpleNamespace(data=data, model=model)
+
+class _Completions:
+    def create(self, model, messages, max_tokens=600, temperature=0.1, timeout=None, **kwargs):
+        latency = STUB_COMPLETION_LATENCY * MODEL_SPEED.get(model, 1.0)
+        if random.random() < STUB_SLOW_RATE:
+            latency *= STUB_SLOW_FACTOR
+        _sleep(latency, timeout)
+        content = f"[{model}] A reflection grounded in the provided context."
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message)])
+
+class StubOpenAI:
+    def __init__(self):
+        self.embeddings = _Embeddings()
+        self.chat = SimpleNamespace(completions=_Completions())
+
+    def with_options(self, **kwargs):
+        return self
+
+class StubIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.vectors = {}
+        for i, (source, law, text) in enumerate(STUB_CORPUS):
+            metadata = {"source_file": source, "chunk_index": 0, "text": text}
+            if law:
+                metadata["law"] = law
+            self.vectors[f"stub_{i}_0"] = {"values": embed_text(text), "metadata": metadata}
+
+    def upsert(self, vectors, **kwargs):
+        with self._lock:
+            for v in vectors:
+                self.vectors[v["id"]] = {"values": v["values"], "metadata": dict(v.get("metadata", {}))}
+        return {"upserted_count": len(vectors)}
+
+    def update(self, id, set_metadata=None, **kwargs):
+        with self._lock:
+            if id in self.vectors and set_metadata:
+                self.vectors[id]["metadata"].update(set_metadata)
+
+    def fetch(self, ids, **kwargs):
+        with self._lock:
+            vectors = {
+                vid: SimpleNamespace(id=vid, values=list(self.vectors[vid]["values"]),
+                                     metadata=dict(self.vectors[vid]["metadata"]))
+                for vid in ids if vid in self.vectors
+            }
+        return SimpleNamespace(vectors=vectors)
+
+    def list(self, prefix="", **kwargs):
+        with self._lock:
+            ids = sorted(i for i in self.vectors if i.startswith(prefix))
+        for start in range(0, len(ids), 100):
+            yield ids[start:start + 100]
+
+    def query(self, vector, top_k=10, include_metadata=True, **kwargs):
+        _sleep(STUB_QUERY_LATENCY)
+        with self._lock:
+            items = list(self.vectors.items())
+        scored = sorted(
+            ((sum(a * b for a, b in zip(vector, v["values"])), vid, v) for vid, v in items),
+            key=lambda s: s[0],
+            reverse=True,
+        )
+        matches = []
+        for score, vid, v in scored[:top_k]:
+            match = {"id": vid, "score": score}
+            if include_metadata:
+                match["metadata"] = dict(v["metadata"])
+            matches.append(match)
+        return {"matches": matches}
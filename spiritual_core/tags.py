@@ -0,0 +1,45 @@
+import os
+import json
+from .clients import load_env
+
+# --- Tag Registry Loader ---
+def load_pdf_tags(path="pdf_tags.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class TagTrie:
+    """Case-insensitive prefix trie mapping document base names to their tags."""
+
+    def __init__(self, registry):
+        self.root = {}
+        for base_name, tags in registry.items():
+            node = self.root
+            for char in base_name.lower():
+                node = node.setdefault(char, {})
+            node[None] = tags
+
+    def match(self, filename):
+        """Return the tags of the longest registered base name that prefixes filename."""
+        node, found = self.root, None
+        for char in filename.lower():
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found = node[None]
+        return found
+
+_tag_trie = None
+
+def get_tag_trie():
+    global _tag_trie
+    if _tag_trie is None:
+        load_env()
+        _tag_trie = TagTrie(load_pdf_tags(os.getenv("PDF_TAGS_PATH", "pdf_tags.json")))
+    return _tag_trie
+
+def get_tag_from_filename(filename):
+    tags = get_tag_trie().match(filename)
+    if tags is None:
+        return {"source": filename}
+    return tags
@@ -0,0 +1,22 @@
+_encoding = None
+
+def get_encoding():
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+def count_tokens(text):
+    return len(get_encoding().encode(text))
+
+def truncate_tokens(text, max_tokens):
+    enc = get_encoding()
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+    return enc.decode(tokens[:max_tokens]).rstrip() + "…", max_tokens
+
+def estimate_tokens(text):
+    # Routing and reporting only need a rough size, so skip tokenizing on the request path
+    return len(text) // 4
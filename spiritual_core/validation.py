@@ -0,0 +1,92 @@
+import os
+import re
+import json
+from .clients import load_env
+
+# --- Rule Loader ---
+def load_sacred_rules(path="sacred_rules.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    for name, rule in rules["rules"].items():
+        # An empty word compiles to an optional group and would block every input
+        if any(not word.strip() for word in rule.get("words", [])):
+            raise ValueError(f"Sacred rule '{name}' in {path} has an empty word")
+    return rules
+
+def words_to_regex(words):
+    # Fold the word list into a character trie and emit it as a nested regex, so
+    # matching cost grows with the text rather than with the blocklist size
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A word ends here but longer words continue, so the rest is optional
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+def compile_sacred_rules(rules):
+    """Compile all rules into one pattern and a map from its group names to rule names.
+
+    Every rule becomes one named group of a single alternation, so the text is
+    scanned once and match.lastgroup tells us which rule fired. Group names are
+    generated because rule names need not be valid Python identifiers.
+    """
+    branches = []
+    group_rules = {}
+    for i, (name, rule) in enumerate(rules["rules"].items()):
+        parts = []
+        words = rule.get("words", [])
+        if words:
+            parts.append(r"\b(?:" + words_to_regex(words) + r")\b")
+        parts.extend(rule.get("patterns", []))
+        if parts:
+            group = f"r{i}"
+            group_rules[group] = name
+            branches.append(f"(?P<{group}>{'|'.join(parts)})")
+    pattern = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+    return pattern, group_rules
+
+class SacredValidator:
+    def __init__(self, rules):
+        self.rules = rules
+        self.pattern, self.group_rules = compile_sacred_rules(rules)
+        self.min_length = rules.get("min_length", {})
+
+    def match(self, text):
+        """Return the name of the first rule found in text, or None."""
+        if self.pattern is None:
+            return None
+        found = self.pattern.search(text)
+        return self.group_rules[found.lastgroup] if found else None
+
+    def validate(self, text):
+        """Return (is_valid, message, rule) where rule names the rule that fired."""
+        rule = self.match(text)
+        if rule:
+            return False, self.rules["rules"][rule]["message"], rule
+        if len(text.strip()) < self.min_length.get("chars", 0):
+            return False, self.min_length["message"], "min_length"
+        return True, "", None
+
+_default_validator = None
+
+def get_sacred_validator():
+    global _default_validator
+    if _default_validator is None:
+        load_env()
+        _default_validator = SacredValidator(load_sacred_rules(os.getenv("SACRED_RULES_PATH", "sacred_rules.json")))
+    return _default_validator
+
+def validate_sacred_input(text):
+    return get_sacred_validator().validate(text)